@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import re
 import requests
@@ -6,8 +7,6 @@ import time
 import os
 import signal
 import sys
-import tkinter as tk
-from tkinter import filedialog
 from typing import List, Dict
 from config_manager import ConfigManager
 from core import CoreProcessor
@@ -79,38 +78,60 @@ def check_and_setup_config() -> bool:
     
     return True
 
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="中英句对名词化结构分析工具")
+    parser.add_argument("--input", help="输入的Excel文件路径；不提供时弹出文件选择对话框")
+    parser.add_argument("--output", help="输出的CSV文件路径（默认：ai_analysis_results.csv）")
+    return parser.parse_args()
+
 def main():
     """主函数"""
+    args = parse_args()
+
     # 检查配置
     if not check_and_setup_config():
         return
-    
+
     logger.info("\n配置检查通过，正在启动程序...")
     logger.info("提示：按 Ctrl+Q 可以随时终止处理并退出程序")
-    
+
     # 启动键盘监听
     keyboard_thread = threading.Thread(target=keyboard_listener, daemon=True)
     keyboard_thread.start()
-    
-    # 创建文件选择对话框
-    root = tk.Tk()
-    root.withdraw()  # 隐藏主窗口
-    excel_file_path = filedialog.askopenfilename(
-        title="选择Excel文件",
-        filetypes=[("Excel files", "*.xlsx *.xls")]
-    )
-
-    if not excel_file_path:
-        logger.error("未选择文件，程序退出。")
-        return
 
-    # 添加保存文件对话框
-    output_csv_path = filedialog.asksaveasfilename(
-        title="选择保存位置",
-        defaultextension=".csv",
-        filetypes=[("CSV files", "*.csv")],
-        initialfile="ai_analysis_results.csv"
-    )
+    excel_file_path = args.input
+    output_csv_path = args.output
+
+    if excel_file_path:
+        if not os.path.exists(excel_file_path):
+            logger.error(f"输入文件不存在：{excel_file_path}")
+            return
+    else:
+        # 未通过--input指定文件时回退到文件选择对话框；
+        # tkinter按需导入，纯命令行运行不再依赖图形环境
+        import tkinter as tk
+        from tkinter import filedialog
+
+        root = tk.Tk()
+        root.withdraw()  # 隐藏主窗口
+        excel_file_path = filedialog.askopenfilename(
+            title="选择Excel文件",
+            filetypes=[("Excel files", "*.xlsx *.xls")]
+        )
+
+        if not excel_file_path:
+            logger.error("未选择文件，程序退出。")
+            return
+
+        # 添加保存文件对话框
+        if not output_csv_path:
+            output_csv_path = filedialog.asksaveasfilename(
+                title="选择保存位置",
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv")],
+                initialfile="ai_analysis_results.csv"
+            )
 
     # 如果用户没有选择保存位置，使用默认路径
     if not output_csv_path:
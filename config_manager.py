@@ -10,6 +10,8 @@ class ConfigManager:
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
         self.config: Dict = {}
+        # 已加载配置对应的文件修改时间，用于跳过重复的磁盘读取
+        self._loaded_mtime: Optional[float] = None
         
         # 配置定义
         self.config_schema = {
@@ -23,7 +25,7 @@ class ConfigManager:
                 "default": "",
                 "required": True,
                 "type": "string",
-                "description": "API 密钥，用于身份验证"
+                "description": "API 密钥，用于身份验证。\n可填写多个密钥（逗号分隔），请求会在各密钥间轮流使用"
             },
             "temperature": {
                 "default": 0.3,
@@ -72,6 +74,30 @@ class ConfigManager:
                 "type": "boolean",
                 "description": "是否启用模拟模式。\n- 开启：不实际调用API，返回模拟数据\n- 关闭：正常调用API"
             },
+            "max_workers": {
+                "default": 4,
+                "required": False,
+                "type": "integer",
+                "min": 1,
+                "max": 32,
+                "description": "并发调用API的线程数。\n推荐值：2-8\n- 值过大可能触发API速率限制"
+            },
+            "min_request_interval": {
+                "default": 0.2,
+                "required": False,
+                "type": "float",
+                "min": 0,
+                "max": 10,
+                "description": "相邻两次API请求之间的最小间隔（秒）。\n推荐值：0.1-1\n- 所有工作线程共享同一限流器\n- 设为0表示不限制请求间隔"
+            },
+            "prompt_batch_size": {
+                "default": 1,
+                "required": False,
+                "type": "integer",
+                "min": 1,
+                "max": 20,
+                "description": "单次API调用合并分析的句对数量。\n- 1：每个句对单独调用（默认）\n- 大于1：多个句对合并进一次请求，摊薄网络开销\n- 批量回复解析失败时自动回退为逐对调用"
+            },
             "batch_size": {
                 "default": 500,
                 "required": False,
@@ -252,6 +278,7 @@ class ConfigManager:
         """保存配置到文件"""
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(self.config, f, indent=4, ensure_ascii=False)
+        self._loaded_mtime = os.stat(self.config_file).st_mtime
 
     def update_config(self) -> Tuple[bool, str]:
         """
@@ -302,9 +329,18 @@ class ConfigManager:
             return None, f"配置文件 {self.config_file} 不存在，已创建默认配置"
 
         try:
+            # 文件未变化时直接复用内存中的配置，只按当前要求重新验证
+            mtime = os.stat(self.config_file).st_mtime
+            if self.config and self._loaded_mtime == mtime:
+                is_valid, error_msg = self.validate_config(require_all_fields)
+                if not is_valid:
+                    return None, f"配置验证失败：{error_msg}"
+                return self.config, None
+
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 self.config = json.load(f)
-            
+            self._loaded_mtime = mtime
+
             # 检查并更新配置
             success, update_msg = self.update_config()
             if not success:
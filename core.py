@@ -1,54 +1,36 @@
 import pandas as pd
-import re
+import hashlib
+import itertools
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import random
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Callable
 from config_manager import ConfigManager
 import csv
 from data_processor import DataProcessor
 from logger import logger
 
-class CoreProcessor:
-    def __init__(self, config: Dict):
-        """初始化处理器"""
-        self.config = config
-        self.stop_processing = False
-        
-        # 从配置中获取API相关设置
-        self.API_KEY = config["api_key"]
-        self.API_ENDPOINT = config["api_endpoint"]
-        self.TEMPERATURE = config.get("temperature", 0.3)
-        self.MAX_TOKENS = config.get("max_tokens", 1000)
-        self.MODEL = config.get("model", "gemini-2.5-flash-preview-04-17-nothink")
-        
-        # 设置句子长度限制
-        self.MIN_SENTENCE_LENGTH = config.get("min_sentence_length", 10)
-        self.MAX_SENTENCE_LENGTH = config.get("max_sentence_length", 500)
-        self.FILTER_INCOMPLETE_SENTENCES = config.get("filter_incomplete_sentences", True)
-        
-        # 模拟模式设置
-        self.MOCK_MODE = config.get("mock_mode", False)
+# orjson（可选依赖）解析JSON比标准库快数倍，未安装时回退到标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
 
-        # 初始化数据处理器
-        self.data_processor = DataProcessor(config)
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
 
-    def set_progress_callback(self, callback: Callable[[str], None]):
-        """设置进度回调函数"""
-        logger.set_callback(callback)
+# 磁盘缓存文件：跨次运行复用相同句对的分析结果
+CACHE_DB_FILE = "analysis_cache.db"
 
-    def log(self, message: str):
-        """记录日志（保持向后兼容）"""
-        logger.info(message)
-
-    def construct_prompt(self, english_sentence: str, chinese_sentence: str) -> str:
-        """构造提示词 (结构化版本)"""
-        # 转义句子中的引号，避免影响JSON解析
-        english_sentence = english_sentence.replace('"', '\\"').replace("'", "\\'")
-        chinese_sentence = chinese_sentence.replace('"', '\\"').replace("'", "\\'")
-        
-        # 定义语言现象 (核心)
-        language_phenomena_definitions = """
+# 语言现象定义（单句对与批量提示词共用）
+_LANGUAGE_PHENOMENA_DEFINITIONS = """
 Language Phenomenon: Nominalization
 Description: Conversion of non-nominal concepts (actions, states, qualities) into noun forms/phrases.
 
@@ -72,8 +54,8 @@ Types:
    - Avoid: Other V-ing phrases without 'of NP' structure
 """
 
-        # 定义翻译技巧 (核心)
-        translation_technique_definitions = """
+# 翻译技巧定义（单句对与批量提示词共用）
+_TRANSLATION_TECHNIQUE_DEFINITIONS = """
 Translation Techniques:
 
 1. Maintain_Noun
@@ -103,21 +85,15 @@ Translation Techniques:
    - Note: Use sparingly and only when other categories clearly don't apply
 """
 
-        # 整体prompt结构
-        prompt = f"""
-[Input]
-English Sentence:
-{english_sentence}
-
-Chinese Translation:
-{chinese_sentence}
-
+# 固定不变的任务说明放进system消息：user消息只剩句对本身，每次请求
+# 少上传约400个token的重复定义，支持前缀缓存的服务商还能少付这部分费用
+_SYSTEM_PROMPT = f"""
 [Task Definition]
 1. Language Phenomenon Analysis:
-   {language_phenomena_definitions}
+   {_LANGUAGE_PHENOMENA_DEFINITIONS}
 
 2. Translation Technique Analysis:
-   {translation_technique_definitions}
+   {_TRANSLATION_TECHNIQUE_DEFINITIONS}
 
 [Output Format]
 Return a JSON list containing identified phenomena and their translation techniques.
@@ -134,7 +110,185 @@ Format:
 Return empty list [] if no phenomena found.
 Ensure valid JSON format.
 """
-        return prompt
+
+# 批量模式的system消息（输出格式带id和analyses包装）
+_BATCH_SYSTEM_PROMPT = f"""
+[Task Definition]
+1. Language Phenomenon Analysis:
+   {_LANGUAGE_PHENOMENA_DEFINITIONS}
+
+2. Translation Technique Analysis:
+   {_TRANSLATION_TECHNIQUE_DEFINITIONS}
+
+[Output Format]
+Analyze each pair independently. Return a JSON list with exactly one object per input pair:
+[
+  {{
+    "id": 1,
+    "analyses": [
+      {{
+        "Identified_Phenomenon_EN": "minimal nominalized phrase",
+        "Phenomenon_Type": "Derivational/Conversional/Phrasal",
+        "Translation_Technique": "Maintain_Noun/Shift_Word_Class/Omit_Structure/Reconstruct_Sentence/Difficult_To_Determine"
+      }},
+      ...
+    ]
+  }},
+  ...
+]
+
+Use an empty "analyses" list for pairs with no phenomena.
+Ensure valid JSON format.
+"""
+
+def _find_balanced_list(text: str, start: int) -> Optional[str]:
+    """从start处的'['开始提取括号配平的片段
+
+    按括号深度做单次正向扫描（跳过字符串字面量内的括号），
+    对任意形状的输入都是线性时间，不会像贪婪正则那样回溯。
+    """
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_json_list(text: str) -> Optional[list]:
+    """从文本中解析出第一个合法的JSON列表
+
+    AI回复中第一处'['未必是结果列表（可能是"[Output]"之类的标题
+    文本），因此逐个尝试每处'['起始的配平片段，跳过解析失败的
+    候选继续向后找。
+    """
+    start = text.find('[')
+    while start != -1:
+        candidate = _find_balanced_list(text, start)
+        if candidate is not None:
+            try:
+                parsed = _json_loads(candidate)
+                if isinstance(parsed, list):
+                    return parsed
+            except ValueError:  # json与orjson的解析错误都是ValueError子类
+                pass
+        start = text.find('[', start + 1)
+    return None
+
+class CoreProcessor:
+    def __init__(self, config: Dict):
+        """初始化处理器"""
+        self.config = config
+        # 停止信号：Event可以在重试/限流等待中被立即感知
+        self._stop_event = threading.Event()
+        
+        # 从配置中获取API相关设置。api_key支持逗号分隔的多个密钥，
+        # 请求在密钥间轮流使用，以突破单密钥的速率限制
+        self.API_KEYS = [k.strip() for k in str(config["api_key"]).split(',') if k.strip()]
+        self._key_cycle = itertools.cycle(self.API_KEYS or [""])
+        self._key_lock = threading.Lock()
+        self.API_ENDPOINT = config["api_endpoint"]
+        self.TEMPERATURE = config.get("temperature", 0.3)
+        self.MAX_TOKENS = config.get("max_tokens", 1000)
+        self.MODEL = config.get("model", "gemini-2.5-flash-preview-04-17-nothink")
+        
+        # 设置句子长度限制
+        self.MIN_SENTENCE_LENGTH = config.get("min_sentence_length", 10)
+        self.MAX_SENTENCE_LENGTH = config.get("max_sentence_length", 500)
+        self.FILTER_INCOMPLETE_SENTENCES = config.get("filter_incomplete_sentences", True)
+        
+        # 模拟模式设置
+        self.MOCK_MODE = config.get("mock_mode", False)
+
+        # 并发与限流设置（分析耗时几乎全部在网络I/O上，线程池可近线性加速）
+        self.MAX_WORKERS = config.get("max_workers", 4)
+        # 单次API调用合并分析的句对数量（1为逐对调用）
+        self.PROMPT_BATCH_SIZE = config.get("prompt_batch_size", 1)
+        self.MIN_REQUEST_INTERVAL = config.get("min_request_interval", 0.2)
+        self._rate_limit_lock = threading.Lock()
+        self._last_request_time = 0.0
+
+        # 相同句对的分析结果缓存（语料中常有重复句对，命中后直接复用结果）
+        self._result_cache: Dict[str, List[Dict]] = {}
+        self._cache_lock = threading.Lock()
+
+        # 磁盘缓存：同一份Excel在开发调试时会反复跑，命中后无需再付费调用API。
+        # 打开失败（如目录只读）时退化为仅内存缓存
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        try:
+            self._cache_conn = sqlite3.connect(CACHE_DB_FILE, check_same_thread=False)
+            self._cache_conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response BLOB)"
+            )
+            self._cache_conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"无法打开磁盘缓存 {CACHE_DB_FILE}：{e}，本次运行仅使用内存缓存")
+            self._cache_conn = None
+
+        # 复用HTTP连接的Session（避免每次请求都重新进行TCP+TLS握手），
+        # 连接池大小与工作线程数一致
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.MAX_WORKERS, pool_maxsize=self.MAX_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # 初始化数据处理器
+        self.data_processor = DataProcessor(config)
+
+    @property
+    def stop_processing(self) -> bool:
+        """是否已请求停止处理"""
+        return self._stop_event.is_set()
+
+    def set_progress_callback(self, callback: Callable[[str], None]):
+        """设置进度回调函数"""
+        logger.set_callback(callback)
+
+    def log(self, message: str):
+        """记录日志（保持向后兼容）"""
+        logger.info(message)
+
+    def construct_prompt(self, english_sentence: str, chinese_sentence: str) -> str:
+        """构造单句对的user消息（任务说明在system消息中）"""
+        # 转义句子中的引号，避免影响JSON解析
+        english_sentence = english_sentence.replace('"', '\\"').replace("'", "\\'")
+        chinese_sentence = chinese_sentence.replace('"', '\\"').replace("'", "\\'")
+
+        return (
+            f"[Input]\n"
+            f"English Sentence:\n{english_sentence}\n\n"
+            f"Chinese Translation:\n{chinese_sentence}"
+        )
+
+    def construct_batch_prompt(self, pairs: List[Dict]) -> str:
+        """构造一次分析多个句对的user消息（任务说明在system消息中）"""
+        blocks = []
+        for i, pair in enumerate(pairs, start=1):
+            # 转义句子中的引号，避免影响JSON解析
+            english_sentence = pair['source_sentence'].replace('"', '\\"').replace("'", "\\'")
+            chinese_sentence = pair['target_sentence'].replace('"', '\\"').replace("'", "\\'")
+            blocks.append(
+                f"<pair id={i}>\n"
+                f"English Sentence:\n{english_sentence}\n\n"
+                f"Chinese Translation:\n{chinese_sentence}\n"
+                f"</pair>"
+            )
+        return "[Input]\n" + "\n\n".join(blocks)
 
     def normalize_nominalization_type(self, result_item: Dict) -> Dict:
         """标准化Nominalization_Type字段"""
@@ -148,6 +302,52 @@ Ensure valid JSON format.
         # 可根据需要添加更多规则
         return result_item
 
+    def _make_cache_key(self, english_sentence: str, chinese_sentence: str) -> str:
+        """生成句对的缓存键（包含模型名，换模型后不会误用旧结果）"""
+        raw = (self.MODEL + '\x00' + english_sentence + '\x00' + chinese_sentence).encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _cache_get(self, cache_key: str) -> Optional[List[Dict]]:
+        """查询缓存：先查内存，再查磁盘；磁盘命中会回填内存"""
+        with self._cache_lock:
+            if cache_key in self._result_cache:
+                return self._result_cache[cache_key]
+            if self._cache_conn is not None:
+                try:
+                    row = self._cache_conn.execute(
+                        "SELECT response FROM cache WHERE key = ?", (cache_key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    return None
+                if row is not None:
+                    results = _json_loads(row[0])
+                    self._result_cache[cache_key] = results
+                    return results
+        return None
+
+    def _cache_put(self, cache_key: str, results: List[Dict]) -> None:
+        """写入缓存（内存+磁盘）"""
+        with self._cache_lock:
+            self._result_cache[cache_key] = results
+            if self._cache_conn is not None:
+                try:
+                    self._cache_conn.execute(
+                        "INSERT OR REPLACE INTO cache VALUES (?, ?)",
+                        (cache_key, _json_dumps(results))
+                    )
+                    self._cache_conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"写入磁盘缓存失败：{e}")
+
+    def _throttle_request(self):
+        """限制API请求的发起间隔，避免触发速率限制"""
+        with self._rate_limit_lock:
+            wait = self._last_request_time + self.MIN_REQUEST_INTERVAL - time.monotonic()
+            if wait > 0:
+                # 用Event等待代替sleep，停止请求可立即打断
+                self._stop_event.wait(wait)
+            self._last_request_time = time.monotonic()
+
     def analyze_sentence_with_ai(self, english_sentence: str, chinese_sentence: str) -> List[Dict]:
         """使用AI分析句子"""
         # 如果启用模拟模式，返回模拟数据
@@ -171,62 +371,166 @@ Ensure valid JSON format.
             # 对模拟数据也做标准化
             return [self.normalize_nominalization_type(item) for item in mock_results]
 
+        # 命中缓存的句对无需再次调用API
+        cache_key = self._make_cache_key(english_sentence, chinese_sentence)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = self.construct_prompt(english_sentence, chinese_sentence)
+        ai_response_content = self._request_ai_content(prompt)
+        if ai_response_content is None:
+            return []
+
+        # 使用更健壮的JSON提取方法
+        parsed_json = _parse_json_list(ai_response_content)
+        if parsed_json is None:
+            logger.warning(f"无法从AI回复中提取有效的JSON列表。\nAI回复：\n{ai_response_content}")
+            return []
+
+        # 对AI返回的每个结果项做标准化
+        results = [self.normalize_nominalization_type(item) for item in parsed_json]
+        self._cache_put(cache_key, results)
+        return results
+
+    def analyze_sentence_pairs_with_ai(self, pairs: List[Dict]) -> List[List[Dict]]:
+        """分析一组句对，按输入顺序返回各自的分析结果
+
+        prompt_batch_size大于1时，把多个句对合并进一次API调用，摊薄
+        每次请求的网络往返开销；批量回复中解析不出的句对回退为逐对调用。
+        """
+        def analyze_single(pair: Dict) -> List[Dict]:
+            return self.analyze_sentence_with_ai(pair['source_sentence'], pair['target_sentence'])
+
+        if self.MOCK_MODE or self.PROMPT_BATCH_SIZE <= 1 or len(pairs) == 1:
+            return [analyze_single(pair) for pair in pairs]
+
+        # 先查缓存，只把未命中的句对放进批量请求
+        results: List[Optional[List[Dict]]] = []
+        pending: List[int] = []
+        for pos, pair in enumerate(pairs):
+            cached = self._cache_get(self._make_cache_key(pair['source_sentence'], pair['target_sentence']))
+            results.append(cached)
+            if cached is None:
+                pending.append(pos)
+
+        if pending:
+            batch_results = self._analyze_batch([pairs[pos] for pos in pending])
+            for pos, batch_result in zip(pending, batch_results):
+                if batch_result is None:
+                    # 逐对调用内部会自行写缓存
+                    results[pos] = analyze_single(pairs[pos])
+                else:
+                    cache_key = self._make_cache_key(pairs[pos]['source_sentence'], pairs[pos]['target_sentence'])
+                    self._cache_put(cache_key, batch_result)
+                    results[pos] = batch_result
+        return results
+
+    def _analyze_batch(self, pairs: List[Dict]) -> List[Optional[List[Dict]]]:
+        """一次API调用分析多个句对；解析不到结果的位置为None"""
+        results: List[Optional[List[Dict]]] = [None] * len(pairs)
+        # 批量回复比单句对长，max_tokens按句对数放大
+        ai_response_content = self._request_ai_content(
+            self.construct_batch_prompt(pairs),
+            system_prompt=_BATCH_SYSTEM_PROMPT,
+            max_tokens=self.MAX_TOKENS * len(pairs)
+        )
+        if ai_response_content is None:
+            return results
+
+        parsed_json = _parse_json_list(ai_response_content)
+        if parsed_json is None:
+            logger.warning(f"无法从批量回复中提取有效的JSON列表，将逐对重试。\nAI回复：\n{ai_response_content}")
+
+        if isinstance(parsed_json, list):
+            for item in parsed_json:
+                if not isinstance(item, dict):
+                    continue
+                pair_id = item.get("id")
+                analyses = item.get("analyses")
+                if isinstance(pair_id, int) and 1 <= pair_id <= len(pairs) and isinstance(analyses, list):
+                    results[pair_id - 1] = [self.normalize_nominalization_type(r) for r in analyses]
+        return results
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """计算重试前的等待时间
+
+        限速类响应优先采用服务端Retry-After头给出的精确等待；否则按
+        指数退避。叠加随机抖动，避免多个工作线程在同一时刻集中重试。
+        """
+        delay = None
+        if response is not None and response.status_code in (429, 503):
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass
+        if delay is None:
+            delay = 2.0 * (2 ** attempt)  # 2, 4, 8...
+        delay = min(delay, 60.0)
+        return delay + random.uniform(0, 0.5 * delay)
+
+    def _request_ai_content(self, prompt: str, system_prompt: str = _SYSTEM_PROMPT,
+                            max_tokens: Optional[int] = None) -> Optional[str]:
+        """调用chat/completions接口并返回AI回复的文本内容，失败返回None"""
+        # 多个工作线程共享同一个限流器，控制整体请求速率
+        self._throttle_request()
+
+        with self._key_lock:
+            api_key = next(self._key_cycle)
         headers = {
-            "Authorization": f"Bearer {self.API_KEY}",
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
-        
+
         payload = {
             "model": self.MODEL,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
             "temperature": self.TEMPERATURE,
-            "max_tokens": self.MAX_TOKENS
+            "max_tokens": max_tokens if max_tokens is not None else self.MAX_TOKENS
         }
 
         max_retries = 3
         for attempt in range(max_retries):
+            if self._stop_event.is_set():
+                return None
             try:
-                response = requests.post(
-                    f"{self.API_ENDPOINT}/chat/completions", 
-                    headers=headers, 
-                    json=payload, 
+                # 预先用_json_dumps序列化（Content-Type已在headers中指定），
+                # 避免requests内部走较慢的标准库json
+                response = self.session.post(
+                    f"{self.API_ENDPOINT}/chat/completions",
+                    headers=headers,
+                    data=_json_dumps(payload),
                     timeout=60
                 )
                 response.raise_for_status()
-                
-                response_json = response.json()
+
+                response_json = _json_loads(response.content)
                 ai_response_content = response_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                
+
                 if not ai_response_content:
                     logger.warning("AI返回了空内容。")
-                    return []
-
-                try:
-                    # 使用更健壮的JSON提取方法
-                    json_match = re.search(r'\[[\s\S]*\]', ai_response_content)
-                    if json_match:
-                        parsed_json = json.loads(json_match.group(0))
-                        # 对AI返回的每个结果项做标准化
-                        return [self.normalize_nominalization_type(item) for item in parsed_json]
-                    else:
-                        logger.warning(f"无法从AI回复中提取有效的JSON列表。\nAI回复：\n{ai_response_content}")
-                        return []
-                except json.JSONDecodeError as e:
-                    logger.error(f"解析AI返回的JSON失败。错误信息：{e}\nAI回复：\n{ai_response_content}")
-                    return []
+                    return None
+                return ai_response_content
 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"API请求错误 (尝试 {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(5 * (attempt + 1))
+                    delay = self._retry_delay(attempt, getattr(e, 'response', None))
+                    # 等待期间收到停止信号则直接放弃重试
+                    if self._stop_event.wait(delay):
+                        return None
                 else:
                     logger.error("已达到最大重试次数，跳过此句对。")
-                    return []
+                    return None
             except Exception as e:
                 logger.error(f"处理API响应时发生未知错误: {e}")
-                return []
-        return []
+                return None
+        return None
 
     def process_file(self, input_file: str, output_file: str) -> bool:
         """处理文件"""
@@ -235,82 +539,93 @@ Ensure valid JSON format.
             logger.info(f"输出文件: {output_file}")
             
             # 创建CSV文件并写入表头
-            fieldnames = ['source_doc_id', 'source_sentence', 'target_doc_id', 'target_sentence', 
-                         'identified_nominalization_en', 'nominalization_type', 
+            fieldnames = ['source_doc_id', 'source_sentence', 'target_doc_id', 'target_sentence',
+                         'identified_nominalization_en', 'nominalization_type',
                          'translation_technique']
-            
-            with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-                writer.writeheader()
-            
+
             # 分批处理句对
             total_processed = 0
             total_analyzed = 0
             total_valid = 0
             total_invalid = 0
             batch_count = 0
-            
-            for batch_sentence_pairs, batch_invalid_pairs in self.data_processor.process_sentence_pairs_batch(input_file):
-                if self.stop_processing:
-                    logger.info("处理已停止")
-                    break
-                
-                batch_count += 1
-                logger.info(f"开始处理第 {batch_count} 批，包含 {len(batch_sentence_pairs)} 个有效句对")
-                
-                # 保存无效句对
-                if batch_invalid_pairs:
-                    self.data_processor.save_invalid_pairs(batch_invalid_pairs, output_file)
-                    total_invalid += len(batch_invalid_pairs)
-                
-                # 处理当前批次的句对
-                for pair in batch_sentence_pairs:
+            # 进度日志限流：普通进度行最多每0.5秒一条，避免刷屏拖慢GUI
+            last_progress_time = 0.0
+
+            # 输出文件在整个处理过程中保持打开，结果边产生边写入，
+            # 每批冲刷一次磁盘，中途终止也能保留已完成的结果
+            with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
+                writer.writeheader()
+
+                for batch_sentence_pairs, batch_invalid_pairs in self.data_processor.process_sentence_pairs_batch(input_file):
                     if self.stop_processing:
+                        logger.info("处理已停止")
                         break
-                        
-                    total_processed += 1
-                    total_valid += 1
-                    logger.info(f"正在处理第 {total_processed} 个句对")
-                    
-                    if total_processed > 1 and total_processed % 5 == 0:
-                        logger.info("暂停1秒以避免API速率限制...")
-                        time.sleep(1)
-
-                    analysis_results = self.analyze_sentence_with_ai(
-                        pair['source_sentence'],
-                        pair['target_sentence']
-                    )
 
-                    # 追加写入结果
-                    with open(output_file, 'a', newline='', encoding='utf-8-sig') as f:
-                        writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-                        
-                        if analysis_results:
-                            total_analyzed += 1
-                            for result_item in analysis_results:
+                    batch_count += 1
+                    logger.info(f"开始处理第 {batch_count} 批，包含 {len(batch_sentence_pairs)} 个有效句对")
+
+                    # 保存无效句对
+                    if batch_invalid_pairs:
+                        self.data_processor.save_invalid_pairs(batch_invalid_pairs, output_file)
+                        total_invalid += len(batch_invalid_pairs)
+
+                    # 按prompt_batch_size分组后并发分析，结果按原顺序消费
+                    group_size = max(1, self.PROMPT_BATCH_SIZE)
+                    groups = [batch_sentence_pairs[i:i + group_size]
+                              for i in range(0, len(batch_sentence_pairs), group_size)]
+
+                    def analyze_group(group):
+                        if self.stop_processing:
+                            return [[] for _ in group]
+                        return self.analyze_sentence_pairs_with_ai(group)
+
+                    with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                        results_iter = executor.map(analyze_group, groups)
+                        for pair, analysis_results in (
+                            (pair, result)
+                            for group, group_results in zip(groups, results_iter)
+                            for pair, result in zip(group, group_results)
+                        ):
+                            # 停止后剩余句对没有真正经过分析，不再写入
+                            # 占位行或计入统计
+                            if self.stop_processing:
+                                break
+                            total_processed += 1
+                            total_valid += 1
+                            now = time.monotonic()
+                            if now - last_progress_time >= 0.5:
+                                logger.info(f"正在处理第 {total_processed} 个句对")
+                                last_progress_time = now
+
+                            if analysis_results:
+                                total_analyzed += 1
+                                for result_item in analysis_results:
+                                    result = {
+                                        'source_doc_id': pair['source_doc_id'],
+                                        'source_sentence': pair['source_sentence'],
+                                        'target_doc_id': pair.get('target_doc_id', ''),
+                                        'target_sentence': pair['target_sentence'],
+                                        'identified_nominalization_en': result_item.get('Identified_Nominalization_EN', 'N/A'),
+                                        'nominalization_type': result_item.get('Nominalization_Type', 'N/A'),
+                                        'translation_technique': result_item.get('Translation_Technique', 'N/A')
+                                    }
+                                    writer.writerow(result)
+                            else:
                                 result = {
                                     'source_doc_id': pair['source_doc_id'],
                                     'source_sentence': pair['source_sentence'],
                                     'target_doc_id': pair.get('target_doc_id', ''),
                                     'target_sentence': pair['target_sentence'],
-                                    'identified_nominalization_en': result_item.get('Identified_Nominalization_EN', 'N/A'),
-                                    'nominalization_type': result_item.get('Nominalization_Type', 'N/A'),
-                                    'translation_technique': result_item.get('Translation_Technique', 'N/A')
+                                    'identified_nominalization_en': 'AI_NO_RESULT_OR_ERROR',
+                                    'nominalization_type': 'N/A',
+                                    'translation_technique': 'N/A'
                                 }
                                 writer.writerow(result)
-                        else:
-                            result = {
-                                'source_doc_id': pair['source_doc_id'],
-                                'source_sentence': pair['source_sentence'],
-                                'target_doc_id': pair.get('target_doc_id', ''),
-                                'target_sentence': pair['target_sentence'],
-                                'identified_nominalization_en': 'AI_NO_RESULT_OR_ERROR',
-                                'nominalization_type': 'N/A',
-                                'translation_technique': 'N/A'
-                            }
-                            writer.writerow(result)
-                
-                logger.info(f"第 {batch_count} 批处理完成")
+
+                    f.flush()
+                    logger.info(f"第 {batch_count} 批处理完成")
             
             logger.info(f"处理完成，总计：\n- 总处理句对：{total_processed}\n- 有效句对：{total_valid}\n- 无效句对：{total_invalid}\n- 成功分析句对：{total_analyzed}\n- 处理批次数：{batch_count}")
             logger.info(f"结果已保存到: {output_file}")
@@ -322,4 +637,4 @@ Ensure valid JSON format.
 
     def stop(self):
         """停止处理"""
-        self.stop_processing = True 
\ No newline at end of file
+        self._stop_event.set() 
\ No newline at end of file
@@ -7,6 +7,14 @@ from logger import logger
 from openpyxl import load_workbook
 import os
 
+# 预编译的正则（句子清理/验证属于每行都会调用的热路径）
+_TAG_RE = re.compile(r'<s>|</s>|doc#\w+\s*')
+_NUM_DOT_RE = re.compile(r'^\d+\s*\.\s*')
+_CHINESE_CHAR_RE = re.compile(r'[\u4e00-\u9fff]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_IGNORABLE_TAIL_RE = re.compile(r'[ \u2018\u2019\u201c\u201d\u0022\u0027\u00ab\u00bb“”‘’«»()\[\]{}]')
+_SENTENCE_END_RE = re.compile(r'[.!?;:。！？；：…—]')
+
 class DataProcessor:
     def __init__(self, config: Dict):
         """初始化数据处理器"""
@@ -47,39 +55,40 @@ class DataProcessor:
         """读取Excel文件，返回生成器"""
         try:
             logger.info(f"开始读取Excel文件: {input_file}")
-            wb = load_workbook(input_file, read_only=True)
+            wb = load_workbook(input_file, read_only=True, data_only=True)
             ws = wb.active
-            
-            # 跳过指定行数
+
+            # 预先整理启用的列，循环内不再反复遍历配置
+            enabled_columns = [
+                (col_name, col_config['index'])
+                for col_name, col_config in self.FILE_STRUCTURE['columns'].items()
+                if col_config['enabled']
+            ]
+            max_column_index = max(index for _, index in enabled_columns)
+
+            # 跳过行数由iter_rows的min_row完成；values_only直接返回
+            # 每行的值元组，省去逐个构建Cell对象的开销；max_col让
+            # 启用列右侧的单元格完全不参与解析
             logger.info(f"跳过前 {self.FILE_STRUCTURE['skip_rows']} 行...")
-            for _ in range(self.FILE_STRUCTURE['skip_rows']):
-                next(ws.rows)
-            
-            # 获取最大列索引
-            max_column_index = max(
-                col['index'] for col in self.FILE_STRUCTURE['columns'].values()
-                if col['enabled']
-            )
-            
-            # 逐行读取数据
             row_count = 0
-            for row in ws.rows:
+            for row in ws.iter_rows(min_row=self.FILE_STRUCTURE['skip_rows'] + 1,
+                                    max_col=max_column_index + 1, values_only=True):
                 # 确保行有足够的列
                 if len(row) >= max_column_index + 1:
                     row_count += 1
                     if row_count % 1000 == 0:
                         logger.info(f"已读取 {row_count} 行...")
-                    
+
                     # 读取数据
-                    data = {}
-                    for col_name, col_config in self.FILE_STRUCTURE['columns'].items():
-                        if col_config['enabled']:
-                            data[col_name] = str(row[col_config['index']].value or '')
-                    
+                    data = {
+                        col_name: str(row[index] or '')
+                        for col_name, index in enabled_columns
+                    }
+
                     # 跳过空行
                     if all(not v.strip() for v in data.values()):
                         continue
-                        
+
                     yield data
             
             logger.info(f"Excel文件读取完成，共读取 {row_count} 行")
@@ -92,17 +101,17 @@ class DataProcessor:
     def clean_sentence(self, text: str) -> str:
         """清理句子文本"""
         # 移除标记和文档ID
-        cleaned = re.sub(r'<s>|</s>|doc#\w+\s*', '', text).strip()
+        cleaned = _TAG_RE.sub('', text).strip()
         # 移除中文句子开头的数字和点
-        cleaned = re.sub(r'^\d+\s*\.\s*', '', cleaned).strip()
+        cleaned = _NUM_DOT_RE.sub('', cleaned).strip()
         
         # 检查是否为中文句子（通过检测是否包含中文字符）
-        if re.search(r'[\u4e00-\u9fff]', cleaned):
+        if _CHINESE_CHAR_RE.search(cleaned):
             # 如果是中文句子，移除所有空格
-            cleaned = re.sub(r'\s+', '', cleaned)
+            cleaned = _WHITESPACE_RE.sub('', cleaned)
         else:
             # 如果是英文句子，只规范化空格（将多个空格替换为单个空格）
-            cleaned = re.sub(r'\s+', ' ', cleaned)
+            cleaned = _WHITESPACE_RE.sub(' ', cleaned)
             
         return cleaned
 
@@ -144,12 +153,12 @@ class DataProcessor:
                 '(', ')', '[', ']', '{', '}'
             ]
             i = len(source_text) - 1
-            while i >= 0 and (source_text[i] in ignore_chars or re.match(r'[ \u2018\u2019\u201c\u201d\u0022\u0027\u00ab\u00bb""''«»()\[\]{}]', source_text[i])):
+            while i >= 0 and (source_text[i] in ignore_chars or _IGNORABLE_TAIL_RE.match(source_text[i])):
                 i -= 1
             if i < 0:
                 return False, '源语言句子为空或全为可忽略字符'
             # 使用Unicode范围来匹配所有可能的标点符号
-            if not re.search(r'[.!?;:。！？；：…—]', source_text[i]):
+            if not _SENTENCE_END_RE.search(source_text[i]):
                 return False, '源语言句子不以标点符号结尾'
 
         # 检查句子长度
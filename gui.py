@@ -1,35 +1,46 @@
 import customtkinter as ctk
 import tkinter as tk
-from typing import Optional, Dict
+from tkinter import filedialog
+from typing import Optional, Dict, Tuple
+import os
 import sys
 import threading
 from config_manager import ConfigManager
 from core import CoreProcessor
 from logger import logger
 
+# 文件对话框的类型过滤器（模块级常量，避免每次打开对话框时重建）
+EXCEL_FILETYPES = [("Excel files", "*.xlsx *.xls")]
+CSV_FILETYPES = [("CSV files", "*.csv")]
+
+# 全局共享的配置管理器（构建schema和默认配置有固定开销，无需每次操作重建）
+config_manager = ConfigManager()
+
 class ConfirmDialog(ctk.CTkToplevel):
     def __init__(self, parent, title: str, message: str, confirm_text: str = "确认", cancel_text: str = "取消"):
         super().__init__(parent)
         
         # 设置窗口
         self.title(title)
-        self.geometry("320x150")
         self.resizable(False, False)
-        
-        # 使窗口模态
-        self.grab_set()
-        
-        # 设置窗口位置为主窗口中心
-        self.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - self.winfo_width()) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - self.winfo_height()) // 2
-        self.geometry(f"+{x}+{y}")
-        
+
+        # 窗口为固定尺寸，可直接计算居中位置，
+        # 无需update_idletasks强制一次完整布局来获取自身大小
+        width, height = 320, 150
+        x = parent.winfo_x() + (parent.winfo_width() - width) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - height) // 2
+        self.geometry(f"{width}x{height}+{x}+{y}")
+
         # 存储结果
         self.result = False
-        
+
         # 创建UI
         self.setup_ui(message, confirm_text, cancel_text)
+
+        # UI构建完成后再设为模态，父窗口在构建期间仍可正常重绘
+        self.transient(parent)
+        self.grab_set()
+        self.focus_force()
         
     def setup_ui(self, message: str, confirm_text: str, cancel_text: str):
         """设置UI布局"""
@@ -47,8 +58,8 @@ class ConfirmDialog(ctk.CTkToplevel):
         )
         message_label.pack(pady=(0, 18))
         
-        # 按钮容器
-        button_frame = ctk.CTkFrame(main_frame)
+        # 按钮容器（纯布局用途，走透明无圆角的轻量绘制路径）
+        button_frame = ctk.CTkFrame(main_frame, corner_radius=0, fg_color="transparent", border_width=0)
         button_frame.pack(fill="x")
         
         # 取消按钮
@@ -85,19 +96,22 @@ class ConfirmDialog(ctk.CTkToplevel):
         self.destroy()
 
 class ConfigDialog(ctk.CTkToplevel):
-    def __init__(self, parent):
+    def __init__(self, parent, manager: Optional[ConfigManager] = None,
+                 config: Optional[Dict] = None, error: Optional[str] = None):
         super().__init__(parent)
-        
+
         # 设置窗口
         self.title("配置设置")
         self.geometry("425x500")
         self.resizable(False, False)
-        
-        # 初始化配置管理器
-        self.config_manager = ConfigManager()
-        config, error = self.config_manager.load_config(require_all_fields=False)
+
+        # 初始化配置管理器（调用方可在后台线程预先加载后传入，避免阻塞UI线程）
+        if manager is None:
+            manager = config_manager
+            config, error = manager.load_config(require_all_fields=False)
+        self.config_manager = manager
         self.config = config or {}
-        
+
         if error:
             logger.error(f"加载配置时发生错误：{error}")
         
@@ -133,29 +147,38 @@ class ConfigDialog(ctk.CTkToplevel):
         self.mock_mode_var = tk.BooleanVar(value=self.config.get("mock_mode", False))
         self.batch_size_var = tk.StringVar(value=str(self.config.get("batch_size", 500)))
         
+        # 文件结构配置（提取一层，避免重复的get链）
+        file_structure = self.config.get("file_structure", {})
+        language = file_structure.get("language", {})
+        columns = file_structure.get("columns", {})
+
         # 文件结构配置变量
-        self.skip_rows_var = tk.StringVar(value=str(self.config.get("file_structure", {}).get("skip_rows", 6)))
-        
+        self.skip_rows_var = tk.StringVar(value=str(file_structure.get("skip_rows", 6)))
+
         # 语言选择变量
-        self.source_lang_code = self.config.get("file_structure", {}).get("language", {}).get("source", "en")
-        self.target_lang_code = self.config.get("file_structure", {}).get("language", {}).get("target", "zh-cn")
+        self.source_lang_code = language.get("source", "en")
+        self.target_lang_code = language.get("target", "zh-cn")
         self.source_lang_var = tk.StringVar(value=self.language_map.get(self.source_lang_code, "英语 (English)"))
         self.target_lang_var = tk.StringVar(value=self.language_map.get(self.target_lang_code, "简体中文 (Simplified Chinese)"))
-        
+
         # 列配置变量
         self.column_vars = {}
-        for col_name, col_config in self.config.get("file_structure", {}).get("columns", {}).items():
+        for col_name, col_config in columns.items():
             self.column_vars[col_name] = {
                 "enabled": tk.BooleanVar(value=col_config.get("enabled", True)),
                 "index": tk.StringVar(value=str(col_config.get("index", 0)))
             }
         
-        # 存储输入框引用
+        # 存储输入框引用及其当前的错误高亮状态
         self.entry_widgets = {}
-        
+        self._field_error_state = {}
+
+        # 为数值字段挂载trace回调，边输入边验证并缓存结果
+        self._register_numeric_traces()
+
         # 标记是否取消配置
         self.cancelled = False
-        
+
         self.setup_ui()
         
         # 使窗口模态
@@ -168,103 +191,158 @@ class ConfigDialog(ctk.CTkToplevel):
         """处理窗口关闭事件"""
         if not self.config_manager.config:  # 如果是首次配置
             self.cancelled = True
-        self.destroy()
-        
-    def validate_numeric_field(self, value: str, field_name: str, min_value: float = None, max_value: float = None) -> bool:
-        """验证数值字段"""
+        self.hide()
+
+    def hide(self):
+        """隐藏窗口（对话框作为单例复用，关闭时只隐藏不销毁）"""
+        self.grab_release()
+        self.withdraw()
+
+    def reload_values(self, config: Optional[Dict], error: Optional[str] = None):
+        """复用已构建的对话框时，把各变量刷新为最新配置值"""
+        self.config = config or {}
+        if error:
+            logger.error(f"加载配置时发生错误：{error}")
+
+        file_structure = self.config.get("file_structure", {})
+        language = file_structure.get("language", {})
+        columns = file_structure.get("columns", {})
+
+        # 暂停trace验证，刷新完成后统一验证一次
+        self._suspend_traces = True
         try:
-            if not value.strip():
-                return True  # 允许空值
-                
-            num_value = float(value)
-            
+            self.api_endpoint_var.set(self.config.get("api_endpoint", ""))
+            self.api_key_var.set(self.config.get("api_key", ""))
+            self.temperature_var.set(str(self.config.get("temperature", 0.3)))
+            self.max_tokens_var.set(str(self.config.get("max_tokens", 1000)))
+            self.model_var.set(self.config.get("model", "gemini-2.5-flash-preview-04-17-nothink"))
+            self.min_length_var.set(str(self.config.get("min_sentence_length", 10)))
+            self.max_length_var.set(str(self.config.get("max_sentence_length", 500)))
+            self.filter_incomplete_var.set(self.config.get("filter_incomplete_sentences", True))
+            self.mock_mode_var.set(self.config.get("mock_mode", False))
+            self.batch_size_var.set(str(self.config.get("batch_size", 500)))
+
+            self.skip_rows_var.set(str(file_structure.get("skip_rows", 6)))
+            self.source_lang_code = language.get("source", "en")
+            self.target_lang_code = language.get("target", "zh-cn")
+            self.source_lang_var.set(self.language_map.get(self.source_lang_code, "英语 (English)"))
+            self.target_lang_var.set(self.language_map.get(self.target_lang_code, "简体中文 (Simplified Chinese)"))
+
+            for col_name, col_config in columns.items():
+                if col_name in self.column_vars:
+                    self.column_vars[col_name]["enabled"].set(col_config.get("enabled", True))
+                    self.column_vars[col_name]["index"].set(str(col_config.get("index", 0)))
+        finally:
+            self._suspend_traces = False
+
+        for field, var_attr, display_name, min_value, max_value in self.NUMERIC_FIELD_RULES:
+            self._on_numeric_change(field, getattr(self, var_attr), display_name, min_value, max_value)
+        
+    # 数值字段的验证规则：(配置键, 变量属性名, 显示名称, 最小值, 最大值)
+    NUMERIC_FIELD_RULES = [
+        ("temperature", "temperature_var", "Temperature", 0, 1),
+        ("max_tokens", "max_tokens_var", "Max Tokens", 1, None),
+        ("min_sentence_length", "min_length_var", "最小句子长度", 1, None),
+        ("max_sentence_length", "max_length_var", "最大句子长度", 1, None),
+        ("batch_size", "batch_size_var", "每批处理数量", 50, 2000),
+    ]
+
+    def validate_numeric_field(self, value: str, field_name: str, min_value: float = None, max_value: float = None) -> Tuple[Optional[float], Optional[str]]:
+        """验证数值字段，返回(解析后的数值, 错误信息)，错误信息为None表示有效"""
+        try:
+            value = value.strip()
+            if not value:
+                return None, None  # 允许空值
+
+            # 纯整数输入走isdigit快速路径，避免异常控制流
+            # （trace验证每个按键都会调用，整数字段占多数）
+            if value.isdigit() or (value[0] == '-' and value[1:].isdigit()):
+                num_value = int(value)
+            else:
+                num_value = float(value)
+
             if min_value is not None and num_value < min_value:
-                logger.error(f"{field_name} 必须大于等于 {min_value}")
-                return False
-                
+                return None, f"{field_name} 必须大于等于 {min_value}"
+
             if max_value is not None and num_value > max_value:
-                logger.error(f"{field_name} 必须小于等于 {max_value}")
-                return False
-                
-            return True
+                return None, f"{field_name} 必须小于等于 {max_value}"
+
+            return num_value, None
         except ValueError:
-            logger.error(f"{field_name} 必须是有效的数字")
-            return False
+            return None, f"{field_name} 必须是有效的数字"
 
     def highlight_error_field(self, field_name: str, is_error: bool):
         """高亮显示错误字段"""
         if field_name in self.entry_widgets:
+            # 边框颜色已经正确时跳过configure，避免多余的重绘
+            if self._field_error_state.get(field_name, False) == is_error:
+                return
+            self._field_error_state[field_name] = is_error
             widget = self.entry_widgets[field_name]
             if is_error:
                 widget.configure(border_color="red")
             else:
                 widget.configure(border_color=["#3B8ED0", "#1F6AA5"])  # 恢复默认颜色
 
-    def validate_all_fields(self) -> bool:
-        """验证所有字段"""
-        is_valid = True
-        
-        # 验证temperature
-        temp_valid = self.validate_numeric_field(
-            self.temperature_var.get(),
-            "Temperature",
-            min_value=0,
-            max_value=1
-        )
-        self.highlight_error_field("temperature", not temp_valid)
-        is_valid = is_valid and temp_valid
-        
-        # 验证max_tokens
-        tokens_valid = self.validate_numeric_field(
-            self.max_tokens_var.get(),
-            "Max Tokens",
-            min_value=1
-        )
-        self.highlight_error_field("max_tokens", not tokens_valid)
-        is_valid = is_valid and tokens_valid
-        
-        # 验证min_sentence_length
-        min_len_valid = self.validate_numeric_field(
-            self.min_length_var.get(),
-            "最小句子长度",
-            min_value=1
-        )
-        self.highlight_error_field("min_sentence_length", not min_len_valid)
-        is_valid = is_valid and min_len_valid
-        
-        # 验证max_sentence_length
-        max_len_valid = self.validate_numeric_field(
-            self.max_length_var.get(),
-            "最大句子长度",
-            min_value=1
-        )
-        self.highlight_error_field("max_sentence_length", not max_len_valid)
-        is_valid = is_valid and max_len_valid
-        
-        # 验证batch_size
-        batch_valid = self.validate_numeric_field(
-            self.batch_size_var.get(),
-            "每批处理数量",
-            min_value=50,
-            max_value=2000
+    def _register_numeric_traces(self):
+        """按规则表为每个数值字段挂载trace回调，并对初始值先验证一次"""
+        self._field_errors = {}
+        self._parsed_values = {}
+        self._suspend_traces = False
+        for field, var_attr, display_name, min_value, max_value in self.NUMERIC_FIELD_RULES:
+            var = getattr(self, var_attr)
+            var.trace_add(
+                "write",
+                lambda *args, f=field, v=var, d=display_name, lo=min_value, hi=max_value:
+                    self._on_numeric_change(f, v, d, lo, hi)
+            )
+            self._on_numeric_change(field, var, display_name, min_value, max_value)
+
+    def _on_numeric_change(self, field: str, var: tk.StringVar, display_name: str,
+                           min_value: float, max_value: float):
+        """数值字段变化时的即时验证，缓存验证状态和解析结果（错误通过边框高亮反馈）"""
+        if self._suspend_traces:
+            return
+        num_value, error = self.validate_numeric_field(
+            var.get(),
+            display_name,
+            min_value=min_value,
+            max_value=max_value
         )
-        self.highlight_error_field("batch_size", not batch_valid)
-        is_valid = is_valid and batch_valid
-        
-        # 验证max_sentence_length > min_sentence_length
-        if max_len_valid and min_len_valid:
-            try:
-                max_len = float(self.max_length_var.get())
-                min_len = float(self.min_length_var.get())
-                if max_len <= min_len:
-                    logger.error("最大句子长度必须大于最小句子长度")
-                    self.highlight_error_field("max_sentence_length", True)
-                    self.highlight_error_field("min_sentence_length", True)
-                    is_valid = False
-            except ValueError:
-                pass
-        
-        return is_valid
+        self._field_errors[field] = error
+        self._parsed_values[field] = num_value
+        self.highlight_error_field(field, error is not None)
+
+    def _apply_cached_error_highlights(self):
+        """把trace缓存的验证错误补为边框高亮
+
+        初始验证在输入框创建之前执行，当时的高亮调用找不到组件而
+        被跳过；各标签页构建完成后据缓存补一次高亮。
+        """
+        for field, error in self._field_errors.items():
+            if error is not None:
+                self.highlight_error_field(field, True)
+
+    def validate_all_fields(self) -> bool:
+        """检查所有字段的验证状态，错误汇总为一条日志（单个字段在输入时已由trace回调验证）"""
+        # 按规则表顺序收集各字段的错误信息
+        errors = [self._field_errors[field]
+                  for field, _, _, _, _ in self.NUMERIC_FIELD_RULES
+                  if self._field_errors.get(field)]
+
+        # 验证max_sentence_length > min_sentence_length（复用trace缓存的解析结果）
+        max_len = self._parsed_values.get("max_sentence_length")
+        min_len = self._parsed_values.get("min_sentence_length")
+        if max_len is not None and min_len is not None and max_len <= min_len:
+            errors.append("最大句子长度必须大于最小句子长度")
+            self.highlight_error_field("max_sentence_length", True)
+            self.highlight_error_field("min_sentence_length", True)
+
+        if errors:
+            # 汇总成一条日志，避免多次触发日志文本框的刷新
+            logger.error("\n".join(errors))
+            return False
+        return True
 
     def setup_ui(self):
         """设置UI布局，增加滚动条，按钮固定底部"""
@@ -273,52 +351,22 @@ class ConfigDialog(ctk.CTkToplevel):
         self.grid_columnconfigure(0, weight=1)
 
         # ========== 滚动内容区 ========== #
-        content_frame = ctk.CTkFrame(self)
-        content_frame.grid(row=0, column=0, sticky="nsew")
-        content_frame.grid_rowconfigure(0, weight=1)
-        content_frame.grid_columnconfigure(0, weight=1)
-
-        # 用Canvas+Frame实现滚动
-        canvas = tk.Canvas(content_frame, borderwidth=0, highlightthickness=0, bg="#222")
-        scrollable_frame = ctk.CTkFrame(canvas)
-        vscrollbar = ctk.CTkScrollbar(content_frame, orientation="vertical", command=canvas.yview)
-        canvas.configure(yscrollcommand=vscrollbar.set)
-
-        vscrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-        # 自动调整滚动区域
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        scrollable_frame.bind("<Configure>", on_frame_configure)
-
-        # 添加鼠标滚轮事件处理
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        def _bind_mousewheel(event):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-            
-        def _unbind_mousewheel(event):
-            canvas.unbind_all("<MouseWheel>")
-            
-        # 当鼠标进入canvas时绑定滚轮事件，离开时解绑
-        canvas.bind("<Enter>", _bind_mousewheel)
-        canvas.bind("<Leave>", _unbind_mousewheel)
+        # CTkScrollableFrame自带滚动条、滚动区域维护和鼠标滚轮绑定
+        scrollable_frame = ctk.CTkScrollableFrame(self)
+        scrollable_frame.grid(row=0, column=0, sticky="nsew")
 
         # ========== 以下内容全部放到scrollable_frame里 ========== #
         # 创建标签页
-        tabview = ctk.CTkTabview(scrollable_frame)
-        tabview.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # API标签页
-        api_tab = tabview.add("API")
+        self.tabview = ctk.CTkTabview(scrollable_frame, command=self._on_tab_changed)
+        self.tabview.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # API标签页（默认显示，立即构建）
+        api_tab = self.tabview.add("API")
         self.setup_api_tab(api_tab)
-        
-        # 文件标签页
-        file_tab = tabview.add("文件")
-        self.setup_file_tab(file_tab)
+
+        # 文件标签页（首次切换到该页时才构建，减少打开对话框时的组件创建量）
+        self._file_tab = self.tabview.add("文件")
+        self._file_tab_built = False
 
         # ========== 底部按钮区，固定在窗口底部 ========== #
         button_frame = ctk.CTkFrame(self)
@@ -335,7 +383,7 @@ class ConfigDialog(ctk.CTkToplevel):
         ctk.CTkButton(
             button_frame,
             text="取消",
-            command=self.destroy,
+            command=self.on_closing,
             width=100
         ).pack(side="right", padx=5, pady=10)
 
@@ -346,204 +394,169 @@ class ConfigDialog(ctk.CTkToplevel):
             width=120
         ).pack(side="left", padx=5, pady=10)
 
+    def _on_tab_changed(self):
+        """标签页切换回调，首次切换到文件页时才构建其内容"""
+        if not self._file_tab_built and self.tabview.get() == "文件":
+            self.setup_file_tab(self._file_tab)
+            self._file_tab_built = True
+
     def setup_api_tab(self, parent):
         """设置API标签页"""
-        # 基础设置区域
+        # 基础设置区域（区域内直接用grid布局，避免每行一个包装Frame）
         basic_frame = ctk.CTkFrame(parent)
         basic_frame.pack(fill="x", padx=10, pady=5)
-        ctk.CTkLabel(basic_frame, text="基础设置", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
-        endpoint_frame = ctk.CTkFrame(basic_frame)
-        endpoint_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(endpoint_frame, text="API端点：").pack(side="left", padx=5)
-        ctk.CTkEntry(endpoint_frame, textvariable=self.api_endpoint_var, width=300).pack(side="left", padx=5)
-        
-        key_frame = ctk.CTkFrame(basic_frame)
-        key_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(key_frame, text="API密钥：").pack(side="left", padx=5)
-        key_entry = ctk.CTkEntry(key_frame, textvariable=self.api_key_var, width=300, show="*")
-        key_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(basic_frame, text="基础设置", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
+        ctk.CTkLabel(basic_frame, text="API端点：").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkEntry(basic_frame, textvariable=self.api_endpoint_var, width=300).grid(row=1, column=1, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(basic_frame, text="API密钥：").grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkEntry(basic_frame, textvariable=self.api_key_var, width=300, show="*").grid(row=2, column=1, sticky="w", padx=5, pady=2)
 
         # 模型参数区域
         model_frame = ctk.CTkFrame(parent)
         model_frame.pack(fill="x", padx=10, pady=10)
-        ctk.CTkLabel(model_frame, text="模型参数", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
-        model_select_frame = ctk.CTkFrame(model_frame)
-        model_select_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(model_select_frame, text="模型：").pack(side="left", padx=5)
-        model_entry = ctk.CTkEntry(model_select_frame, textvariable=self.model_var, width=300)
-        model_entry.pack(side="left", padx=5)
-        
-        temp_frame = ctk.CTkFrame(model_frame)
-        temp_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(temp_frame, text="Temperature：").pack(side="left", padx=5)
-        temp_entry = ctk.CTkEntry(temp_frame, textvariable=self.temperature_var, width=100)
-        temp_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(model_frame, text="模型参数", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=3, sticky="w", padx=5, pady=5)
+
+        ctk.CTkLabel(model_frame, text="模型：").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkEntry(model_frame, textvariable=self.model_var, width=300).grid(row=1, column=1, columnspan=2, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(model_frame, text="Temperature：").grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        temp_entry = ctk.CTkEntry(model_frame, textvariable=self.temperature_var, width=100)
+        temp_entry.grid(row=2, column=1, sticky="w", padx=5, pady=2)
         self.entry_widgets["temperature"] = temp_entry
-        ctk.CTkLabel(temp_frame, text="(0-1之间的值)").pack(side="left", padx=5)
-        
-        tokens_frame = ctk.CTkFrame(model_frame)
-        tokens_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(tokens_frame, text="Max Tokens：").pack(side="left", padx=5)
-        tokens_entry = ctk.CTkEntry(tokens_frame, textvariable=self.max_tokens_var, width=100)
-        tokens_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(model_frame, text="(0-1之间的值)").grid(row=2, column=2, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(model_frame, text="Max Tokens：").grid(row=3, column=0, sticky="w", padx=5, pady=2)
+        tokens_entry = ctk.CTkEntry(model_frame, textvariable=self.max_tokens_var, width=100)
+        tokens_entry.grid(row=3, column=1, sticky="w", padx=5, pady=2)
         self.entry_widgets["max_tokens"] = tokens_entry
 
         # 运行模式区域
         mode_frame = ctk.CTkFrame(parent)
         mode_frame.pack(fill="x", padx=10, pady=10)
-        ctk.CTkLabel(mode_frame, text="运行模式", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
-        mock_frame = ctk.CTkFrame(mode_frame)
-        mock_frame.pack(fill="x", padx=5, pady=2)
-        mock_checkbox = ctk.CTkCheckBox(
-            mock_frame,
+        ctk.CTkLabel(mode_frame, text="运行模式", font=("Arial", 14, "bold")).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        ctk.CTkCheckBox(
+            mode_frame,
             text="启用模拟模式（不实际调用API）",
             variable=self.mock_mode_var
-        )
-        mock_checkbox.pack(side="left", padx=5)
+        ).grid(row=1, column=0, sticky="w", padx=5, pady=2)
+
+        # 初始值就非法的字段在此补上错误高亮
+        self._apply_cached_error_highlights()
 
     def setup_file_tab(self, parent):
         """设置文件标签页"""
-        # 语言设置区域
+        # 语言设置区域（区域内直接用grid布局，避免每行一个包装Frame）
         lang_frame = ctk.CTkFrame(parent)
         lang_frame.pack(fill="x", padx=10, pady=5)
-        ctk.CTkLabel(lang_frame, text="语言设置", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
-        # 源语言选择
-        source_lang_frame = ctk.CTkFrame(lang_frame)
-        source_lang_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(source_lang_frame, text="源语言：").pack(side="left", padx=5)
-        
-        # 创建源语言下拉框
-        source_lang_values = list(self.language_map.keys())
-        source_lang_display = [self.language_map[code] for code in source_lang_values]
-        source_lang_combo = ctk.CTkComboBox(
-            source_lang_frame,
-            values=source_lang_display,
+        ctk.CTkLabel(lang_frame, text="语言设置", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, sticky="w", padx=5, pady=5)
+
+        # 下拉框的显示值列表（源/目标共用）
+        lang_display_values = [self.language_map[code] for code in self.language_map]
+
+        ctk.CTkLabel(lang_frame, text="源语言：").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkComboBox(
+            lang_frame,
+            values=lang_display_values,
             variable=self.source_lang_var,
             width=200,
             command=lambda x: self._on_language_select(x, "source")
-        )
-        source_lang_combo.pack(side="left", padx=5)
-        
-        # 目标语言选择
-        target_lang_frame = ctk.CTkFrame(lang_frame)
-        target_lang_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(target_lang_frame, text="目标语言：").pack(side="left", padx=5)
-        
-        # 创建目标语言下拉框
-        target_lang_values = list(self.language_map.keys())
-        target_lang_display = [self.language_map[code] for code in target_lang_values]
-        target_lang_combo = ctk.CTkComboBox(
-            target_lang_frame,
-            values=target_lang_display,
+        ).grid(row=1, column=1, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(lang_frame, text="目标语言：").grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkComboBox(
+            lang_frame,
+            values=lang_display_values,
             variable=self.target_lang_var,
             width=200,
             command=lambda x: self._on_language_select(x, "target")
-        )
-        target_lang_combo.pack(side="left", padx=5)
-        
+        ).grid(row=2, column=1, sticky="w", padx=5, pady=2)
+
         # 设置初始值
         self._set_initial_language_values()
-        
+
         # 列设置区域
         columns_frame = ctk.CTkFrame(parent)
         columns_frame.pack(fill="x", padx=10, pady=10)
-        ctk.CTkLabel(columns_frame, text="列设置", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
+        columns_frame.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(columns_frame, text="列设置", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=4, sticky="w", padx=5, pady=5)
+
         # 列配置表格
-        for col_name, col_config in self.column_vars.items():
-            col_frame = ctk.CTkFrame(columns_frame)
-            col_frame.pack(fill="x", padx=5, pady=2)
-            
+        for row, (col_name, col_config) in enumerate(self.column_vars.items(), start=1):
             # 列名
-            col_label = ctk.CTkLabel(col_frame, text=self.get_column_display_name(col_name))
-            col_label.pack(side="left", padx=5)
-            
+            ctk.CTkLabel(columns_frame, text=self.get_column_display_name(col_name)).grid(row=row, column=0, sticky="w", padx=5, pady=2)
+
             # 启用复选框（仅对可选列显示）
             if col_name not in ['source_text', 'target_text']:
-                enabled_checkbox = ctk.CTkCheckBox(
-                    col_frame,
+                ctk.CTkCheckBox(
+                    columns_frame,
                     text="启用",
                     variable=col_config["enabled"]
-                )
-                enabled_checkbox.pack(side="left", padx=5)
-            
+                ).grid(row=row, column=1, sticky="w", padx=5, pady=2)
+
             # 列索引
-            ctk.CTkLabel(col_frame, text="列索引：").pack(side="right", padx=5)
-            index_entry = ctk.CTkEntry(col_frame, textvariable=col_config["index"], width=50)
-            index_entry.pack(side="right", padx=5)
+            ctk.CTkLabel(columns_frame, text="列索引：").grid(row=row, column=2, sticky="e", padx=5, pady=2)
+            ctk.CTkEntry(columns_frame, textvariable=col_config["index"], width=50).grid(row=row, column=3, sticky="e", padx=5, pady=2)
 
         # 处理参数区域
         process_frame = ctk.CTkFrame(parent)
         process_frame.pack(fill="x", padx=10, pady=10)
-        ctk.CTkLabel(process_frame, text="处理参数", font=("Arial", 14, "bold")).pack(anchor="w", padx=5, pady=5)
-        
+        ctk.CTkLabel(process_frame, text="处理参数", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=3, sticky="w", padx=5, pady=5)
+
         # 跳过行数设置
-        skip_rows_frame = ctk.CTkFrame(process_frame)
-        skip_rows_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(skip_rows_frame, text="跳过行数：").pack(side="left", padx=5)
-        skip_rows_entry = ctk.CTkEntry(skip_rows_frame, textvariable=self.skip_rows_var, width=50)
-        skip_rows_entry.pack(side="left", padx=5)
-        ctk.CTkLabel(skip_rows_frame, text="(从第几行开始读取数据)").pack(side="left", padx=5)
-        
+        ctk.CTkLabel(process_frame, text="跳过行数：").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ctk.CTkEntry(process_frame, textvariable=self.skip_rows_var, width=50).grid(row=1, column=1, sticky="w", padx=5, pady=2)
+        ctk.CTkLabel(process_frame, text="(从第几行开始读取数据)").grid(row=1, column=2, sticky="w", padx=5, pady=2)
+
         # 每批处理数量
-        batch_frame = ctk.CTkFrame(process_frame)
-        batch_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(batch_frame, text="每批处理数量：").pack(side="left", padx=5)
-        batch_entry = ctk.CTkEntry(batch_frame, textvariable=self.batch_size_var, width=100)
-        batch_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(process_frame, text="每批处理数量：").grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        batch_entry = ctk.CTkEntry(process_frame, textvariable=self.batch_size_var, width=100)
+        batch_entry.grid(row=2, column=1, sticky="w", padx=5, pady=2)
         self.entry_widgets["batch_size"] = batch_entry
-        ctk.CTkLabel(batch_frame, text="(推荐: 200-1000)").pack(side="left", padx=5)
-        
+        ctk.CTkLabel(process_frame, text="(推荐: 200-1000)").grid(row=2, column=2, sticky="w", padx=5, pady=2)
+
         # 句子长度设置
-        length_frame = ctk.CTkFrame(process_frame)
-        length_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(length_frame, text="句子长度：").pack(side="left", padx=5)
-        
-        min_len_frame = ctk.CTkFrame(length_frame)
-        min_len_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(min_len_frame, text="最小长度：").pack(side="left", padx=5)
-        min_len_entry = ctk.CTkEntry(min_len_frame, textvariable=self.min_length_var, width=100)
-        min_len_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(process_frame, text="句子长度：").grid(row=3, column=0, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(process_frame, text="最小长度：").grid(row=4, column=0, sticky="e", padx=5, pady=2)
+        min_len_entry = ctk.CTkEntry(process_frame, textvariable=self.min_length_var, width=100)
+        min_len_entry.grid(row=4, column=1, sticky="w", padx=5, pady=2)
         self.entry_widgets["min_sentence_length"] = min_len_entry
-        ctk.CTkLabel(min_len_frame, text="(推荐: 10-20)").pack(side="left", padx=5)
-        
-        max_len_frame = ctk.CTkFrame(length_frame)
-        max_len_frame.pack(fill="x", padx=5, pady=2)
-        ctk.CTkLabel(max_len_frame, text="最大长度：").pack(side="left", padx=5)
-        max_len_entry = ctk.CTkEntry(max_len_frame, textvariable=self.max_length_var, width=100)
-        max_len_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(process_frame, text="(推荐: 10-20)").grid(row=4, column=2, sticky="w", padx=5, pady=2)
+
+        ctk.CTkLabel(process_frame, text="最大长度：").grid(row=5, column=0, sticky="e", padx=5, pady=2)
+        max_len_entry = ctk.CTkEntry(process_frame, textvariable=self.max_length_var, width=100)
+        max_len_entry.grid(row=5, column=1, sticky="w", padx=5, pady=2)
         self.entry_widgets["max_sentence_length"] = max_len_entry
-        ctk.CTkLabel(max_len_frame, text="(推荐: 300-500)").pack(side="left", padx=5)
-        
+        ctk.CTkLabel(process_frame, text="(推荐: 300-500)").grid(row=5, column=2, sticky="w", padx=5, pady=2)
+
         # 过滤选项
-        filter_frame = ctk.CTkFrame(process_frame)
-        filter_frame.pack(fill="x", padx=5, pady=2)
-        filter_checkbox = ctk.CTkCheckBox(
-            filter_frame,
+        ctk.CTkCheckBox(
+            process_frame,
             text="过滤非完整句子（不以标点符号结尾）",
             variable=self.filter_incomplete_var
-        )
-        filter_checkbox.pack(side="left", padx=5)
-        
+        ).grid(row=6, column=0, columnspan=3, sticky="w", padx=5, pady=2)
+
         # 风险提示
-        risk_frame = ctk.CTkFrame(process_frame)
         risk_text = "提示：\n" + \
                    "- 长度设置过低可能导致语言识别不理想。"
-        ctk.CTkLabel(risk_frame, text=risk_text, justify="left").pack(anchor="w", padx=5, pady=5)
+        ctk.CTkLabel(process_frame, text=risk_text, justify="left").grid(row=7, column=0, columnspan=3, sticky="w", padx=5, pady=5)
+
+        # 初始值就非法的字段在此补上错误高亮
+        self._apply_cached_error_highlights()
+
+    # 列的中文显示名称（类属性，避免每次查询都重建字典）
+    COLUMN_DISPLAY_NAMES = {
+        "source_doc_id": "源语言文档编号",
+        "source_text": "源语言文本",
+        "target_doc_id": "目标语言文档编号",
+        "target_text": "目标语言文本"
+    }
 
     def get_column_display_name(self, col_name: str) -> str:
         """获取列的中文显示名称"""
-        display_names = {
-            "source_doc_id": "源语言文档编号",
-            "source_text": "源语言文本",
-            "target_doc_id": "目标语言文档编号",
-            "target_text": "目标语言文本"
-        }
-        return display_names.get(col_name, col_name)
+        return self.COLUMN_DISPLAY_NAMES.get(col_name, col_name)
 
     def _on_language_select(self, display_value: str, lang_type: str):
         """处理语言选择事件"""
@@ -581,8 +594,11 @@ class ConfigDialog(ctk.CTkToplevel):
             # 获取配置管理器的默认值
             default_config = self.config_manager.default_config
             
-            # 构建新配置，对空值使用默认值
-            new_config = {
+            # 以现有配置为底构建新配置，对话框未暴露的键（如max_workers、
+            # prompt_batch_size）在保存时得以保留；对空值使用默认值
+            new_config = {k: v for k, v in self.config_manager.config.items()
+                          if not k.startswith('_')}
+            new_config.update({
                 "api_endpoint": self.api_endpoint_var.get().strip(),
                 "api_key": self.api_key_var.get().strip(),
                 "temperature": float(self.temperature_var.get()) if self.temperature_var.get().strip() else default_config["temperature"],
@@ -607,15 +623,19 @@ class ConfigDialog(ctk.CTkToplevel):
                         for col_name, col_config in self.column_vars.items()
                     }
                 }
+            })
+
+            # 记录未填写、已用默认值代替的字段（只检查会回退默认值的标量字段）
+            defaultable_fields = {
+                "temperature": self.temperature_var,
+                "max_tokens": self.max_tokens_var,
+                "model": self.model_var,
+                "min_sentence_length": self.min_length_var,
+                "max_sentence_length": self.max_length_var,
+                "batch_size": self.batch_size_var,
             }
-            
-            # 检查是否有字段被重置为默认值
-            reset_fields = []
-            for field, value in new_config.items():
-                if field in ["api_endpoint", "api_key"]:  # 跳过必填字段
-                    continue
-                if str(value) != str(self.config.get(field, "")):
-                    reset_fields.append(field)
+            reset_fields = [field for field, var in defaultable_fields.items()
+                            if not var.get().strip()]
             
             # 验证已填写的配置
             is_valid, error_msg = self.config_manager.validate_field_values(new_config)
@@ -625,17 +645,22 @@ class ConfigDialog(ctk.CTkToplevel):
             
             # 更新配置管理器中的配置
             self.config_manager.config = new_config
-            
-            # 保存配置
-            self.config_manager._save_config()
-            
+
             # 如果有字段被重置为默认值，显示提示
             if reset_fields:
                 reset_message = "以下字段未填写，已自动使用默认值：\n" + "\n".join(f"- {field}" for field in reset_fields)
                 logger.info(reset_message)
-            
-            logger.info("配置已保存")
-            self.destroy()
+
+            # 磁盘写入放到后台线程，Tk回调中不做阻塞I/O，对话框立即关闭
+            def save_to_disk():
+                try:
+                    self.config_manager._save_config()
+                    logger.info("配置已保存")
+                except Exception as e:
+                    logger.error(f"保存配置文件时发生错误：{str(e)}")
+
+            threading.Thread(target=save_to_disk, daemon=True).start()
+            self.hide()
             
         except ValueError as e:
             logger.error(f"错误：{str(e)}")
@@ -659,29 +684,34 @@ class ConfigDialog(ctk.CTkToplevel):
         
         # 如果用户确认，执行还原操作
         if dialog.result:
-            self.api_endpoint_var.set("")
-            self.api_key_var.set("")
-            self.temperature_var.set("0.3")
-            self.max_tokens_var.set("1000")
-            self.model_var.set("gemini-2.5-flash-preview-04-17-nothink")
-            self.min_length_var.set("10")
-            self.max_length_var.set("500")
-            self.filter_incomplete_var.set(True)
-            self.mock_mode_var.set(False)
-            self.batch_size_var.set("500")
-            
-            # 重置文件结构配置
-            self.skip_rows_var.set("6")
-            self.source_lang_var.set("英语 (English)")
-            self.target_lang_var.set("简体中文 (Simplified Chinese)")
-            for col_name, col_config in self.column_vars.items():
-                col_config["enabled"].set(True)
-                col_config["index"].set(str(self.config_manager.default_config["file_structure"]["columns"][col_name]["index"]))
-            
-            # 重置所有输入框的边框颜色
-            for field in self.entry_widgets:
-                self.highlight_error_field(field, False)
-            
+            # 暂停trace验证，避免逐个set都触发一次回调，全部设置完后统一验证
+            self._suspend_traces = True
+            try:
+                self.api_endpoint_var.set("")
+                self.api_key_var.set("")
+                self.temperature_var.set("0.3")
+                self.max_tokens_var.set("1000")
+                self.model_var.set("gemini-2.5-flash-preview-04-17-nothink")
+                self.min_length_var.set("10")
+                self.max_length_var.set("500")
+                self.filter_incomplete_var.set(True)
+                self.mock_mode_var.set(False)
+                self.batch_size_var.set("500")
+
+                # 重置文件结构配置
+                self.skip_rows_var.set("6")
+                self.source_lang_var.set("英语 (English)")
+                self.target_lang_var.set("简体中文 (Simplified Chinese)")
+                for col_name, col_config in self.column_vars.items():
+                    col_config["enabled"].set(True)
+                    col_config["index"].set(str(self.config_manager.default_config["file_structure"]["columns"][col_name]["index"]))
+            finally:
+                self._suspend_traces = False
+
+            # 统一验证一次，同时恢复输入框的边框颜色
+            for field, var_attr, display_name, min_value, max_value in self.NUMERIC_FIELD_RULES:
+                self._on_numeric_change(field, getattr(self, var_attr), display_name, min_value, max_value)
+
             logger.info("已还原为默认配置")
 
 class MainGUI:
@@ -701,6 +731,10 @@ class MainGUI:
         self.is_processing = False
         self.processor: Optional[CoreProcessor] = None
         self.processing_thread: Optional[threading.Thread] = None
+        # 停止请求标记：处理器在工作线程中构建，点击停止时可能还不存在
+        self._stop_requested = False
+        # 设置对话框单例，首次打开时构建，之后复用
+        self._config_dialog: Optional[ConfigDialog] = None
 
         # 创建UI
         self.setup_ui()
@@ -783,37 +817,36 @@ class MainGUI:
         self.log_text = ctk.CTkTextbox(self.log_frame, wrap="word", state="disabled")
         self.log_text.pack(fill="both", expand=True, padx=5, pady=2)
 
-        # 设置日志文本框
-        logger.set_text_widget(self.log_text)
+        # 设置日志文本框（推迟到事件循环空闲后再接线，不拖慢首帧绘制）
+        self.root.after_idle(logger.set_text_widget, self.log_text)
 
     def select_input_file(self):
         """选择输入文件"""
-        file_path = tk.filedialog.askopenfilename(
+        file_path = filedialog.askopenfilename(
             title="选择Excel文件",
-            filetypes=[("Excel files", "*.xlsx *.xls")]
+            filetypes=EXCEL_FILETYPES
         )
         if file_path:
             self.input_file_path = file_path
             # 显示文件名而不是完整路径
-            self.input_path_label.configure(text=file_path.split("/")[-1])
+            self.input_path_label.configure(text=os.path.basename(file_path))
 
     def select_output_file(self):
         """选择输出文件保存位置"""
-        file_path = tk.filedialog.asksaveasfilename(
+        file_path = filedialog.asksaveasfilename(
             title="选择保存位置",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
+            filetypes=CSV_FILETYPES,
             initialfile="ai_analysis_results.csv"
         )
         if file_path:
             self.output_file_path = file_path
             # 显示文件名而不是完整路径
-            self.output_path_label.configure(text=file_path.split("/")[-1])
+            self.output_path_label.configure(text=os.path.basename(file_path))
 
     def start_processing(self):
         """开始处理"""
         # 获取配置
-        config_manager = ConfigManager()
         config, error = config_manager.load_config(require_all_fields=True)
         if not config:
             logger.error(f"配置不完整，请先完成必要设置。{error if error else ''}")
@@ -823,28 +856,28 @@ class MainGUI:
             logger.error("请先选择输入和输出文件！")
             return
 
-        # 创建处理器
-        self.processor = CoreProcessor(config)
-
         # 更新UI状态
-        self.is_processing = True
-        self.start_btn.configure(state="disabled")
-        self.stop_btn.configure(state="normal")
-        self.select_input_btn.configure(state="disabled")
-        self.select_output_btn.configure(state="disabled")
-        self.settings_btn.configure(state="disabled")
-
-        # 在新线程中运行处理
+        self._set_controls_state(processing=True)
+        self._stop_requested = False
+
+        # 在新线程中构建处理器并运行
         self.processing_thread = threading.Thread(
             target=self._run_processing,
+            args=(config,),
             daemon=True
         )
         self.processing_thread.start()
 
-    def _run_processing(self):
+    def _run_processing(self, config: Dict):
         """在新线程中运行处理逻辑"""
         try:
-            success = self.processor.process_file(
+            # 处理器在工作线程中构建，构造开销（含数据处理器初始化）不占用UI线程
+            processor = CoreProcessor(config)
+            self.processor = processor
+            # 构建期间用户可能已点击停止
+            if self._stop_requested:
+                processor.stop()
+            success = processor.process_file(
                 self.input_file_path,
                 self.output_file_path
             )
@@ -856,15 +889,19 @@ class MainGUI:
             logger.error(f"处理过程中发生错误: {str(e)}")
             self.root.after(0, self._processing_finished, False)
 
+    def _set_controls_state(self, processing: bool):
+        """根据是否正在处理，统一切换各控制按钮的状态"""
+        self.is_processing = processing
+        idle_state = "disabled" if processing else "normal"
+        self.stop_btn.configure(state="normal" if processing else "disabled")
+        for btn in (self.start_btn, self.select_input_btn,
+                    self.select_output_btn, self.settings_btn):
+            btn.configure(state=idle_state)
+
     def _processing_finished(self, success: bool):
         """处理完成后的回调"""
-        self.is_processing = False
-        self.start_btn.configure(state="normal")
-        self.stop_btn.configure(state="disabled")
-        self.select_input_btn.configure(state="normal")
-        self.select_output_btn.configure(state="normal")
-        self.settings_btn.configure(state="normal")
-        
+        self._set_controls_state(processing=False)
+
         if success:
             logger.info("处理完成！")
         else:
@@ -872,14 +909,29 @@ class MainGUI:
 
     def stop_processing(self):
         """停止处理"""
+        # 先记录停止请求：当前运行的处理器可能还未构建完成，
+        # _run_processing构建后会检查该标记
+        self._stop_requested = True
         if self.processor:
             self.processor.stop()
-            logger.info("正在停止处理...")
+        logger.info("正在停止处理...")
 
     def open_settings(self):
-        """打开设置窗口"""
-        config_dialog = ConfigDialog(self.root)
-        self.root.wait_window(config_dialog)
+        """打开设置窗口（配置文件在后台线程加载，避免阻塞UI）"""
+        def load_and_open():
+            config, error = config_manager.load_config(require_all_fields=False)
+            self.root.after(0, self._show_settings_dialog, config, error)
+
+        threading.Thread(target=load_and_open, daemon=True).start()
+
+    def _show_settings_dialog(self, config: Optional[Dict], error: Optional[str]):
+        """在主线程中显示设置窗口（窗口构建一次后作为单例复用）"""
+        if self._config_dialog is None or not self._config_dialog.winfo_exists():
+            self._config_dialog = ConfigDialog(self.root, config_manager, config, error)
+        else:
+            self._config_dialog.reload_values(config, error)
+            self._config_dialog.deiconify()
+            self._config_dialog.grab_set()
 
     def run(self):
         """运行GUI程序"""
@@ -1,57 +1,107 @@
 import sys
+import time
+from collections import deque
 from typing import Optional, Callable
-from datetime import datetime
 import customtkinter as ctk
 
 class Logger:
     """统一的日志处理类"""
-    
+
     # 日志级别
     INFO = "INFO"
     WARNING = "WARNING"
     ERROR = "ERROR"
-    
+
+    # GUI文本框刷新间隔（毫秒）和保留的最大行数
+    FLUSH_INTERVAL_MS = 50
+    MAX_WIDGET_LINES = 1000
+
     def __init__(self):
         """初始化日志处理器"""
         self.callback: Optional[Callable[[str], None]] = None
         self.text_widget: Optional[ctk.CTkTextbox] = None
         self.original_stdout = sys.stdout
-    
+        # 待写入GUI的日志缓冲区（deque.append是线程安全的）
+        self._pending_messages: deque = deque()
+        # 时间戳字符串按秒缓存，同一秒内的日志不重复格式化
+        self._last_ts_sec: int = -1
+        self._last_ts_str: str = ""
+        # 根据已配置的输出目标生成专用的log函数
+        self._rebuild_log()
+
     def set_callback(self, callback: Callable[[str], None]):
         """设置日志回调函数"""
         self.callback = callback
-    
+        self._rebuild_log()
+
     def set_text_widget(self, text_widget: ctk.CTkTextbox):
-        """设置GUI文本框组件"""
+        """设置GUI文本框组件，并启动定时批量刷新"""
         self.text_widget = text_widget
-    
+        self._rebuild_log()
+        text_widget.after(self.FLUSH_INTERVAL_MS, self._flush_to_widget)
+
+    def _rebuild_log(self):
+        """按当前配置的输出目标组装专用的log函数
+
+        输出目标只在启动时设置一次，提前把分支判断固化成直达各
+        目标的闭包，省去每条日志对callback/text_widget的判空。
+        """
+        fmt = self._format_message
+        callback = self.callback
+        widget_write = self._write_to_widget if self.text_widget else None
+        stdout_write = self.original_stdout.write
+
+        if callback and widget_write:
+            def _log(message: str, level: str = self.INFO):
+                formatted = fmt(level, message)
+                callback(formatted)
+                widget_write(formatted)
+                stdout_write(formatted + "\n")
+        elif widget_write:
+            def _log(message: str, level: str = self.INFO):
+                formatted = fmt(level, message)
+                widget_write(formatted)
+                stdout_write(formatted + "\n")
+        elif callback:
+            def _log(message: str, level: str = self.INFO):
+                formatted = fmt(level, message)
+                callback(formatted)
+                stdout_write(formatted + "\n")
+        else:
+            def _log(message: str, level: str = self.INFO):
+                formatted = fmt(level, message)
+                stdout_write(formatted + "\n")
+
+        self.log = _log
+
     def _format_message(self, level: str, message: str) -> str:
         """格式化日志消息"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return f"[{timestamp}] [{level}] {message}"
-    
+        now = int(time.time())
+        if now != self._last_ts_sec:
+            self._last_ts_sec = now
+            self._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{self._last_ts_str}] [{level}] {message}"
+
     def _write_to_widget(self, message: str):
-        """写入到GUI文本框"""
-        if self.text_widget:
-            self.text_widget.configure(state="normal")
-            self.text_widget.insert("end", message + "\n")
-            self.text_widget.see("end")
-            self.text_widget.configure(state="disabled")
-    
-    def log(self, message: str, level: str = INFO):
-        """记录日志"""
-        formatted_message = self._format_message(level, message)
-        
-        # 使用回调函数
-        if self.callback:
-            self.callback(formatted_message)
-        
-        # 写入GUI文本框
-        if self.text_widget:
-            self._write_to_widget(formatted_message)
-        
-        # 写入标准输出
-        self.original_stdout.write(formatted_message + "\n")
+        """缓存消息，由定时刷新批量写入GUI文本框"""
+        self._pending_messages.append(message)
+
+    def _flush_to_widget(self):
+        """把缓冲区中的日志一次性写入文本框（每个刷新周期只触发一次重绘）"""
+        widget = self.text_widget
+        if widget is None:
+            return
+        if self._pending_messages:
+            drained = []
+            while self._pending_messages:
+                drained.append(self._pending_messages.popleft())
+            widget.configure(state="normal")
+            widget.insert("end", "\n".join(drained) + "\n")
+            # 限制文本框行数，避免长时间运行后重绘越来越慢
+            widget.delete("1.0", f"end-{self.MAX_WIDGET_LINES}l")
+            widget.see("end")
+            widget.configure(state="disabled")
+        widget.after(self.FLUSH_INTERVAL_MS, self._flush_to_widget)
     
     def info(self, message: str):
         """记录信息级别日志"""